@@ -148,9 +148,11 @@ print(f"\nAnswer: {answer}")
 
 
 # ============================================================================
-# Example 7: Batch Processing - Ask Multiple Questions
+# Example 7: Batch Processing - Ask Multiple Questions Concurrently
 # ============================================================================
 
+import asyncio
+
 from backend import AIBackend
 
 backend = AIBackend()
@@ -170,14 +172,22 @@ questions = [
 
 print("\n--- Batch Processing Example ---\n")
 
-for question in questions:
-    try:
-        response = backend.generate_response(question)
+async def process_questions():
+    """Dispatch all questions concurrently so API round-trips overlap"""
+    return await asyncio.gather(
+        *[backend.agenerate_response(q) for q in questions],
+        return_exceptions=True
+    )
+
+responses = asyncio.run(process_questions())
+
+for question, response in zip(questions, responses):
+    if isinstance(response, Exception):
+        print(f"Error processing question: {response}\n")
+    else:
         print(f"Q: {question}")
         print(f"A: {response}\n")
         print("-" * 80 + "\n")
-    except Exception as e:
-        print(f"Error processing question: {e}\n")
 
 
 # ============================================================================
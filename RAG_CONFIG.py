@@ -3,6 +3,8 @@ Configuration file for RAG and application settings
 Customize these values to optimize performance based on your needs
 """
 
+from functools import lru_cache
+
 # ============================================================================
 # RAG (Retrieval-Augmented Generation) Configuration
 # ============================================================================
@@ -188,6 +190,7 @@ SMALL_PROJECT_CONFIG = {
 # Import Configuration
 # ============================================================================
 
+@lru_cache(maxsize=1)
 def get_rag_config():
     """Get RAG configuration as a dictionary"""
     return {
@@ -199,6 +202,7 @@ def get_rag_config():
         "use_rag": FEATURE_RAG_ENABLED
     }
 
+@lru_cache(maxsize=1)
 def get_llm_config():
     """Get LLM configuration as a dictionary"""
     return {
@@ -208,6 +212,7 @@ def get_llm_config():
         "verbose": VERBOSE_LOGGING
     }
 
+@lru_cache(maxsize=1)
 def get_ui_config():
     """Get UI configuration as a dictionary"""
     return {
@@ -65,9 +65,10 @@ if submit_button and user_input:
                 "content": user_input
             })
             
-            # Generate response
-            with st.spinner("🤔 Thinking..."):
-                response = st.session_state.backend.generate_response(user_input)
+            # Stream the response so tokens appear as they are generated
+            response = st.write_stream(
+                st.session_state.backend.stream_response(user_input)
+            )
             
             # Add assistant message to chat history
             st.session_state.messages.append({
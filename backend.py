@@ -3,23 +3,74 @@ Backend module for AI Chatbot
 Handles LangChain integration and Gemini API communication with RAG
 """
 
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain_core.prompts import PromptTemplate
-from typing import Optional
-import os
-from rag_loader import TerraformRAG
+import asyncio
+import collections
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, Optional
+from RAG_CONFIG import CONTEXT_WINDOW, RAG_RETRIEVAL_COUNT
 
-# Simple memory implementation for conversation history
+if TYPE_CHECKING:
+    from rag_loader import TerraformRAG
+
+# The LangChain/Gemini and rag_loader imports pull in pydantic, faiss and
+# the google-ai client (~seconds of cold start), so they are deferred to
+# first initialization - importing this module stays cheap for users who
+# never send a message. NO_CONTEXT_FOUND is filled in by _ensure_rag
+# alongside the rag_loader import.
+NO_CONTEXT_FOUND: Optional[str] = None
+
+# Prompt template for RAG responses
+# Plain string formatted with str.format - no chain/template machinery
+# on the per-call path
+RAG_PROMPT_TEMPLATE = """You are a Terraform documentation assistant. Use only the provided Terraform configuration context to answer the question. Present the answer clearly.
+
+                    Terraform Configuration Context:
+                    {context}
+
+                    Question:
+                    {question}
+
+                    Answer:"""
+
+# Template pre-split once at import so per-call prompt assembly is plain
+# string concatenation, with no variable-substitution pass on the hot path
+_PROMPT_PREFIX, _prompt_rest = RAG_PROMPT_TEMPLATE.split("{context}")
+_PROMPT_MID, _PROMPT_SUFFIX = _prompt_rest.split("{question}")
+del _prompt_rest
+
+# Canned reply used when retrieval finds nothing relevant
+NO_CONTEXT_RESPONSE = (
+    "I cannot answer this question as it is not covered in the provided "
+    "Terraform files. Please ask about resources and configurations "
+    "defined in your GCP Terraform files."
+)
+
+
+# Compact per-turn message record - a named tuple costs a fraction of
+# the memory of a two-key dict and skips hash-table construction on the
+# hot save_context path
+Msg = collections.namedtuple("Msg", ["input", "output"])
+
+
+# Simple sliding-window memory implementation for conversation history
+# Keeps only the most recent `window` turns so prompt size and memory
+# stay bounded instead of growing with every turn
 class ConversationBufferMemory:
-    def __init__(self):
-        self.messages = []
-        
+    def __init__(self, window: int = CONTEXT_WINDOW):
+        self.window = window
+        # deque(maxlen=...) gives O(1) append with automatic eviction
+        self.messages = collections.deque(maxlen=window or None)
+
     def save_context(self, inputs, outputs):
-        self.messages.append({"input": inputs.get("input", ""), "output": outputs.get("output", "")})
-        
+        self.messages.append(Msg(inputs.get("input", ""), outputs.get("output", "")))
+
     def clear(self):
-        self.messages = []
-        
+        self.messages.clear()
+
+    def __len__(self):
+        return len(self.messages)
+
     @property
     def buffer_as_messages(self):
         return self.messages
@@ -39,8 +90,20 @@ class AIBackend:
         self.current_model: Optional[str] = None
         self.current_temperature: float = 0.7
         self.current_max_tokens: int = 500
-        self.terraform_rag: Optional[TerraformRAG] = None
+        self.terraform_rag: Optional["TerraformRAG"] = None
         self.use_rag: bool = True
+        self._rag_api_key: Optional[str] = None
+        # Memoized structural lookups, valid while the Terraform files
+        # are unchanged (keyed by a fingerprint of their mtimes)
+        self._summary_cache: Optional[tuple] = None
+        self._details_cache: dict = {}
+        self._details_fingerprint: Optional[tuple] = None
+        # Fingerprint of the files the RAG document set was loaded from;
+        # a mismatch means the RAG layer must reload before re-querying
+        self._rag_docs_fingerprint: Optional[tuple] = None
+        # Background worker used to warm up the LLM connection while
+        # retrieval is still running
+        self._executor = ThreadPoolExecutor(max_workers=1)
     
     def initialize_chain(
         self,
@@ -59,57 +122,87 @@ class AIBackend:
             temperature: Temperature parameter for creativity (0.0-2.0)
             max_tokens: Maximum tokens in the response
         """
-        # Check if we need to reinitialize (model or key changed)
+        # RAG is keyed only on the API key; LLM settings are cheap to
+        # rebuild, so a temperature/max_tokens tweak skips the RAG setup
+        self._ensure_rag(api_key)
+        self._ensure_llm(api_key, model_name, temperature, max_tokens)
+
+    def _ensure_llm(
+        self,
+        api_key: str,
+        model_name: str,
+        temperature: float,
+        max_tokens: int
+    ) -> None:
+        """
+        (Re)build the LLM only when its configuration changed
+        This is cheap - no network calls, no re-embedding
+
+        Args:
+            api_key: Google API key for authentication
+            model_name: Name of the Gemini model to use
+            temperature: Temperature parameter for creativity (0.0-2.0)
+            max_tokens: Maximum tokens in the response
+        """
         if (
-            self.llm is None
-            or self.current_api_key != api_key
-            or self.current_model != model_name
-            or self.current_temperature != temperature
-            or self.current_max_tokens != max_tokens
+            self.llm is not None
+            and self.current_api_key == api_key
+            and self.current_model == model_name
+            and self.current_temperature == temperature
+            and self.current_max_tokens == max_tokens
         ):
-            try:
-                # Set environment variable
-                os.environ["GOOGLE_API_KEY"] = api_key
-                
-                # Initialize LLM
-                self.llm = ChatGoogleGenerativeAI(
-                    model=model_name,
-                    temperature=temperature,
-                    max_output_tokens=max_tokens,
-                    google_api_key=api_key
-                )
-                
-                # Initialize RAG with Terraform files
-                try:
-                    self.terraform_rag = TerraformRAG(terraform_dir="terraform_files")
-                    self.terraform_rag.create_vector_store(api_key)
-                    
-                    # Create RAG prompt template
-                    self.rag_prompt_template = PromptTemplate(
-                        input_variables=["context", "question"],
-                        template="""You are a Terraform documentation assistant. Use only the provided Terraform configuration context to answer the question. Present the answer clearly. 
+            return
 
-                    Terraform Configuration Context:
-                    {context}
+        try:
+            # Deferred import - see module docstring note on cold start
+            from langchain_google_genai import ChatGoogleGenerativeAI
 
-                    Question:
-                    {question}
+            # Initialize LLM
+            self.llm = ChatGoogleGenerativeAI(
+                model=model_name,
+                temperature=temperature,
+                max_output_tokens=max_tokens,
+                google_api_key=api_key
+            )
+
+            # Store current configuration
+            self.current_api_key = api_key
+            self.current_model = model_name
+            self.current_temperature = temperature
+            self.current_max_tokens = max_tokens
+
+        except Exception as e:
+            raise Exception(f"Failed to initialize LLM: {str(e)}")
+
+    def _ensure_rag(self, api_key: str) -> None:
+        """
+        (Re)build the RAG system only when the API key changed
+        The expensive vector store setup is untouched by LLM-only tweaks
+
+        Args:
+            api_key: Google API key for embeddings
+        """
+        if self.terraform_rag is not None and self._rag_api_key == api_key:
+            return
+
+        # Initialize RAG with Terraform files
+        # (shared per-process instance; only built on first use)
+        try:
+            # Deferred import - rag_loader drags in faiss/numpy/langchain
+            global NO_CONTEXT_FOUND
+            from rag_loader import get_or_build_rag, NO_CONTEXT_FOUND as _no_context
+            NO_CONTEXT_FOUND = _no_context
+
+            self.terraform_rag = get_or_build_rag(api_key, terraform_dir="terraform_files")
+
+            # Plain string template; formatted per call
+            self.rag_prompt_template = RAG_PROMPT_TEMPLATE
+            self._rag_api_key = api_key
+            self._rag_docs_fingerprint = self._files_fingerprint()
+        except Exception as e:
+            print(f"Warning: RAG initialization failed: {str(e)}. Continuing without RAG.")
+            self.use_rag = False
 
-                    Answer:"""
-                    )
-                except Exception as e:
-                    print(f"Warning: RAG initialization failed: {str(e)}. Continuing without RAG.")
-                    self.use_rag = False
-                
-                # Store current configuration
-                self.current_api_key = api_key
-                self.current_model = model_name
-                self.current_temperature = temperature
-                self.current_max_tokens = max_tokens
-                
-            except Exception as e:
-                raise Exception(f"Failed to initialize LLM: {str(e)}")
-    
     def generate_response(self, user_input: str) -> str:
         """
         Generate a response from the AI based on user input
@@ -125,28 +218,36 @@ class AIBackend:
         Raises:
             Exception: If the conversation chain is not initialized
         """
-        if self.llm is None:
+        # Bind the hot attributes to locals once - per-message code below
+        # then uses LOAD_FAST instead of repeated attribute lookups
+        llm = self.llm
+        rag = self.terraform_rag
+
+        if llm is None:
             raise Exception("LLM not initialized. Please provide API key and settings.")
-        
+
         # RAG must be available and initialized - do not fall back to generic LLM
-        if not (self.use_rag and self.terraform_rag and self.rag_prompt_template):
+        if rag is None or not (self.use_rag and self.rag_prompt_template):
             raise Exception("RAG system not initialized. Cannot generate response without Terraform context.")
-        
+
         try:
-            # Retrieve relevant context from Terraform files (k=6 to get all 6 files)
-            context = self.terraform_rag.retrieve_context(user_input, k=6)
-            
+            # Warm up the Gemini connection in the background so the LLM
+            # call can start as soon as retrieval finishes
+            self._executor.submit(self._prewarm_llm)
+
+            # Retrieve relevant context from Terraform files
+            context = rag.retrieve_context(user_input, k=RAG_RETRIEVAL_COUNT)
+
             # Check if we actually got relevant context
-            if "No relevant Terraform configuration found" in context:
+            if context == NO_CONTEXT_FOUND:
                 # No relevant context found - return message indicating this
-                response = "I cannot answer this question as it is not covered in the provided Terraform files. Please ask about resources and configurations defined in your GCP Terraform files."
+                response = NO_CONTEXT_RESPONSE
             else:
-                # Generate response using LLM with formatted prompt
-                formatted_prompt = self.rag_prompt_template.format(
-                    context=context,
-                    question=user_input
-                )
-                response = self.llm.invoke(formatted_prompt).content
+                # Drop duplicate chunks and trim to the prompt budget
+                context = self._compact_context(context)
+                # Generate response using LLM with the pre-split prompt
+                formatted_prompt = f"{_PROMPT_PREFIX}{context}{_PROMPT_MID}{user_input}{_PROMPT_SUFFIX}"
+                response = llm.invoke(formatted_prompt).content
             
             # Also store in conversation memory
             self.memory.save_context({"input": user_input}, {"output": response})
@@ -154,20 +255,188 @@ class AIBackend:
             return response
         except Exception as e:
             raise Exception(f"Failed to retrieve context from Terraform files: {str(e)}")
-    
+
+    def stream_response(self, user_input: str) -> Iterator[str]:
+        """
+        Stream a response token-by-token instead of blocking for the
+        full generation - the UI can show the first tokens after prefill
+        rather than waiting for the whole response
+
+        Args:
+            user_input: The user's input message
+
+        Yields:
+            Response text chunks as they arrive from the LLM
+
+        Raises:
+            Exception: If the conversation chain is not initialized
+        """
+        if self.llm is None:
+            raise Exception("LLM not initialized. Please provide API key and settings.")
+
+        if not (self.use_rag and self.terraform_rag and self.rag_prompt_template):
+            raise Exception("RAG system not initialized. Cannot generate response without Terraform context.")
+
+        self._executor.submit(self._prewarm_llm)
+
+        context = self.terraform_rag.retrieve_context(user_input, k=RAG_RETRIEVAL_COUNT)
+
+        if context == NO_CONTEXT_FOUND:
+            response = NO_CONTEXT_RESPONSE
+            self.memory.save_context({"input": user_input}, {"output": response})
+            yield response
+            return
+
+        context = self._compact_context(context)
+        formatted_prompt = f"{_PROMPT_PREFIX}{context}{_PROMPT_MID}{user_input}{_PROMPT_SUFFIX}"
+
+        # Accumulate chunks locally so memory still sees the full response
+        pieces = []
+        for chunk in self.llm.stream(formatted_prompt):
+            text = chunk.content
+            if text:
+                pieces.append(text)
+                yield text
+
+        self.memory.save_context({"input": user_input}, {"output": "".join(pieces)})
+
+    async def astream_response(self, user_input: str):
+        """
+        Async variant of stream_response using llm.astream
+        Combines the async retrieval path with token streaming
+
+        Args:
+            user_input: The user's input message
+
+        Yields:
+            Response text chunks as they arrive from the LLM
+
+        Raises:
+            Exception: If the conversation chain is not initialized
+        """
+        if self.llm is None:
+            raise Exception("LLM not initialized. Please provide API key and settings.")
+
+        if not (self.use_rag and self.terraform_rag and self.rag_prompt_template):
+            raise Exception("RAG system not initialized. Cannot generate response without Terraform context.")
+
+        context = await self.terraform_rag.aretrieve_context(user_input, k=RAG_RETRIEVAL_COUNT)
+
+        if context == NO_CONTEXT_FOUND:
+            self.memory.save_context({"input": user_input}, {"output": NO_CONTEXT_RESPONSE})
+            yield NO_CONTEXT_RESPONSE
+            return
+
+        context = self._compact_context(context)
+        formatted_prompt = f"{_PROMPT_PREFIX}{context}{_PROMPT_MID}{user_input}{_PROMPT_SUFFIX}"
+
+        pieces = []
+        async for chunk in self.llm.astream(formatted_prompt):
+            text = chunk.content
+            if text:
+                pieces.append(text)
+                yield text
+
+        self.memory.save_context({"input": user_input}, {"output": "".join(pieces)})
+
+    def _compact_context(self, context: str) -> str:
+        """
+        Deduplicate retrieved context chunks and trim to a prompt budget
+        Overlapping chunks often repeat across retrieved documents, and
+        redundant tokens only inflate the LLM prefill cost
+
+        Args:
+            context: Combined context string from retrieval
+
+        Returns:
+            Context with duplicate chunks removed, capped at a character
+            budget proportional to the configured max_tokens
+        """
+        separator = "\n\n---\n\n"
+
+        # Preserve order while dropping exact duplicate chunks
+        unique_parts = list(dict.fromkeys(
+            part.strip() for part in context.split(separator) if part.strip()
+        ))
+
+        # ~4 chars per token, 3x the response budget for context
+        budget_chars = 4 * self.current_max_tokens * 3
+
+        compacted = []
+        total = 0
+        for part in unique_parts:
+            if compacted and total + len(part) > budget_chars:
+                break
+            compacted.append(part)
+            total += len(part) + len(separator)
+
+        return separator.join(compacted)
+
+    def _prewarm_llm(self) -> None:
+        """
+        Best-effort warm-up of the Gemini client connection
+        A tiny token-count RPC opens the HTTP channel so the subsequent
+        generation request skips the connection handshake
+        """
+        try:
+            self.llm.get_num_tokens("ping")
+        except Exception:
+            pass
+
+    async def agenerate_response(self, user_input: str) -> str:
+        """
+        Async variant of generate_response for concurrent batch processing
+        Independent questions can be dispatched together with asyncio.gather
+        so their network round-trips overlap instead of running serially
+
+        Args:
+            user_input: The user's input message
+
+        Returns:
+            The AI's response as a string (only from Terraform files)
+
+        Raises:
+            Exception: If the conversation chain is not initialized
+        """
+        if self.llm is None:
+            raise Exception("LLM not initialized. Please provide API key and settings.")
+
+        if not (self.use_rag and self.terraform_rag and self.rag_prompt_template):
+            raise Exception("RAG system not initialized. Cannot generate response without Terraform context.")
+
+        try:
+            context = await self.terraform_rag.aretrieve_context(user_input, k=RAG_RETRIEVAL_COUNT)
+
+            if context == NO_CONTEXT_FOUND:
+                response = NO_CONTEXT_RESPONSE
+            else:
+                context = self._compact_context(context)
+                formatted_prompt = f"{_PROMPT_PREFIX}{context}{_PROMPT_MID}{user_input}{_PROMPT_SUFFIX}"
+                response = (await self.llm.ainvoke(formatted_prompt)).content
+
+            self.memory.save_context({"input": user_input}, {"output": response})
+
+            return response
+        except Exception as e:
+            raise Exception(f"Failed to retrieve context from Terraform files: {str(e)}")
+
     def clear_memory(self) -> None:
         """Clear the conversation memory and reset the chain"""
         self.memory.clear()
         self.llm = None
     
-    def get_conversation_history(self) -> dict:
+    def get_conversation_history(self) -> list:
         """
         Get the current conversation history from memory
         
         Returns:
-            Dictionary containing conversation buffer variables
+            List of {"input": ..., "output": ...} dicts, one per turn
         """
-        return self.memory.buffer_as_messages if hasattr(self.memory, 'buffer_as_messages') else {}
+        if not hasattr(self.memory, 'buffer_as_messages'):
+            return {}
+        # Messages are stored as compact tuples; expose dicts at the API
+        # boundary for callers that expect them
+        return [{"input": m.input, "output": m.output} for m in self.memory.buffer_as_messages]
     
     def is_ready(self) -> bool:
         """
@@ -188,13 +457,44 @@ class AIBackend:
         """
         if self.terraform_rag is None:
             raise Exception("RAG not initialized")
-        
+
+        fingerprint = self._files_fingerprint()
+        if self._summary_cache is not None and self._summary_cache[0] == fingerprint:
+            return self._summary_cache[1]
+
+        self._sync_rag_documents(fingerprint)
+
         try:
-            return self.terraform_rag.get_resources_summary()
+            summary = self.terraform_rag.get_resources_summary()
+            self._summary_cache = (fingerprint, summary)
+            return summary
         except Exception as e:
             print(f"Could not get infrastructure summary: {str(e)}")
             return {}
     
+    async def aget_infrastructure_summary(self) -> dict:
+        """
+        Async variant of get_infrastructure_summary
+        Runs the document scan off the event loop so independent lookups
+        can be combined with asyncio.gather
+
+        Returns:
+            Dictionary with infrastructure summary
+        """
+        return await asyncio.to_thread(self.get_infrastructure_summary)
+
+    async def aget_resource_details(self, resource_type: str = None) -> dict:
+        """
+        Async variant of get_resource_details
+
+        Args:
+            resource_type: Optional filter by resource type
+
+        Returns:
+            Dictionary with resource details
+        """
+        return await asyncio.to_thread(self.get_resource_details, resource_type)
+
     def get_resource_details(self, resource_type: str = None) -> dict:
         """
         Get detailed information about resources
@@ -207,9 +507,53 @@ class AIBackend:
         """
         if self.terraform_rag is None:
             raise Exception("RAG not initialized")
-        
+
+        fingerprint = self._files_fingerprint()
+        if self._details_fingerprint != fingerprint:
+            self._details_cache.clear()
+            self._details_fingerprint = fingerprint
+        if resource_type in self._details_cache:
+            return self._details_cache[resource_type]
+
+        self._sync_rag_documents(fingerprint)
+
         try:
-            return self.terraform_rag.get_resource_details(resource_type)
+            details = self.terraform_rag.get_resource_details(resource_type)
+            self._details_cache[resource_type] = details
+            return details
         except Exception as e:
             print(f"Could not get resource details: {str(e)}")
             return {}
+
+    def _sync_rag_documents(self, fingerprint: tuple) -> None:
+        """
+        Reload the RAG document set when the source files have changed
+        TerraformRAG memoizes its extractions until load_terraform_files
+        runs, so a fingerprint change must reload before re-querying or
+        the stale result would just be re-cached under the new key
+
+        Args:
+            fingerprint: Current fingerprint from _files_fingerprint
+        """
+        if self._rag_docs_fingerprint == fingerprint:
+            return
+
+        try:
+            self.terraform_rag.load_terraform_files()
+            self._rag_docs_fingerprint = fingerprint
+        except Exception as e:
+            print(f"Warning: could not reload Terraform files: {str(e)}")
+
+    def _files_fingerprint(self) -> tuple:
+        """
+        Fingerprint of the source files used to invalidate the memoized
+        summary/details lookups when a file changes
+        Covers .pdf as well as .tf since the summaries count both
+
+        Returns:
+            Sorted tuple of (path, mtime_ns) pairs
+        """
+        terraform_dir = self.terraform_rag.terraform_dir if self.terraform_rag else "terraform_files"
+        terraform_path = Path(terraform_dir)
+        files = list(terraform_path.glob("*.tf")) + list(terraform_path.glob("*.pdf"))
+        return tuple(sorted((str(p), p.stat().st_mtime_ns) for p in files))
@@ -3,10 +3,47 @@ Script to check all available models in Google Generative AI API
 Run this to see what models are available for your API key
 """
 
+import io
 import os
+import pickle
+import sys
+import time
+from pathlib import Path
 from dotenv import load_dotenv
 import google.generativeai as genai
 
+# Models change rarely - cache the listing on disk for a day so repeat
+# runs skip the network round-trip
+MODELS_CACHE_PATH = Path.home() / ".cache" / "genai_models.pkl"
+MODELS_CACHE_TTL_SECONDS = 24 * 3600
+
+# Separators built once instead of per print call
+SEP = "-" * 80
+HEADER = "=" * 80
+
+
+def load_models():
+    """Return the model list, reusing the on-disk cache while fresh"""
+    try:
+        if (MODELS_CACHE_PATH.exists()
+                and time.time() - MODELS_CACHE_PATH.stat().st_mtime < MODELS_CACHE_TTL_SECONDS):
+            with open(MODELS_CACHE_PATH, "rb") as f:
+                return pickle.load(f)
+    except Exception:
+        pass  # Corrupt/unreadable cache - fall through to the API
+
+    models = list(genai.list_models())
+
+    try:
+        MODELS_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(MODELS_CACHE_PATH, "wb") as f:
+            pickle.dump(models, f)
+    except Exception:
+        pass  # Caching is best effort
+
+    return models
+
+
 # Load environment variables
 load_dotenv()
 
@@ -28,77 +65,86 @@ print("AVAILABLE MODELS IN GOOGLE GENERATIVE AI API")
 print("=" * 80)
 
 try:
-    # List all available models
-    all_models = list(genai.list_models())
-    
-    print(f"\n✅ Total models found: {len(all_models)}\n")
-    
-    # Categorize models
+    # List all available models (cached on disk for 24h)
+    all_models = load_models()
+
+    # Buffer all report output and write it to stdout once at the end -
+    # dozens of print calls each acquire the stdout lock and flush
+    buf = io.StringIO()
+
+    buf.write(f"\n✅ Total models found: {len(all_models)}\n\n")
+
+    # Categorize models and collect their details in a single pass
     embedding_models = []
     chat_models = []
     other_models = []
-    
+    detail_lines = []
+
     for model in all_models:
         model_name = model.name
         display_name = model.display_name
-        
+
         model_info = f"{model_name} ({display_name})"
-        
-        # Categorize by name
-        if "embedding" in model_name.lower() or "embed" in model_name.lower():
+
+        # Categorize by name (lowercase once, not per check)
+        name_lower = model_name.lower()
+        if "embedding" in name_lower or "embed" in name_lower:
             embedding_models.append((model_name, model_info, model))
-        elif "gemini" in model_name.lower() or "chat" in model_name.lower():
+        elif "gemini" in name_lower or "chat" in name_lower:
             chat_models.append((model_name, model_info, model))
         else:
             other_models.append((model_name, model_info, model))
-    
-    # Print embedding models
-    print("📊 EMBEDDING MODELS:")
-    print("-" * 80)
+
+        # Detailed info for the same model, emitted after the categories
+        detail_lines.append(f"Model Name: {model.name}")
+        detail_lines.append(f"Display Name: {model.display_name}")
+        detail_lines.append(f"Description: {model.description}")
+
+        # Show token limits if available
+        if hasattr(model, 'input_token_limit'):
+            detail_lines.append(f"Input Token Limit: {model.input_token_limit}")
+        if hasattr(model, 'output_token_limit'):
+            detail_lines.append(f"Output Token Limit: {model.output_token_limit}")
+
+        detail_lines.append(SEP + "\n")
+
+    # Embedding models
+    buf.write("📊 EMBEDDING MODELS:\n")
+    buf.write(SEP + "\n")
     if embedding_models:
         for model_name, model_info, model_obj in embedding_models:
-            print(f"  ✓ {model_info}")
+            buf.write(f"  ✓ {model_info}\n")
     else:
-        print("  (None found)")
-    
-    # Print chat/generation models
-    print("\n💬 CHAT/GENERATION MODELS:")
-    print("-" * 80)
+        buf.write("  (None found)\n")
+
+    # Chat/generation models
+    buf.write("\n💬 CHAT/GENERATION MODELS:\n")
+    buf.write(SEP + "\n")
     if chat_models:
         for model_name, model_info, model_obj in chat_models:
-            print(f"  ✓ {model_info}")
+            buf.write(f"  ✓ {model_info}\n")
     else:
-        print("  (None found)")
-    
-    # Print other models
+        buf.write("  (None found)\n")
+
+    # Other models
     if other_models:
-        print("\n🔧 OTHER MODELS:")
-        print("-" * 80)
+        buf.write("\n🔧 OTHER MODELS:\n")
+        buf.write(SEP + "\n")
         for model_name, model_info, model_obj in other_models:
-            print(f"  ✓ {model_info}")
-    
-    print("\n" + "=" * 80)
-    print("DETAILED MODEL INFORMATION:")
-    print("=" * 80 + "\n")
-    
-    for model in all_models:
-        print(f"Model Name: {model.name}")
-        print(f"Display Name: {model.display_name}")
-        print(f"Description: {model.description}")
-        
-        # Show token limits if available
-        if hasattr(model, 'input_token_limit'):
-            print(f"Input Token Limit: {model.input_token_limit}")
-        if hasattr(model, 'output_token_limit'):
-            print(f"Output Token Limit: {model.output_token_limit}")
-        
-        print("-" * 80 + "\n")
-    
+            buf.write(f"  ✓ {model_info}\n")
+
+    buf.write("\n" + HEADER + "\n")
+    buf.write("DETAILED MODEL INFORMATION:\n")
+    buf.write(HEADER + "\n\n")
+
+    buf.write("\n".join(detail_lines))
+    buf.write("\n")
+
     # Recommendations
-    print("\n" + "=" * 80)
-    print("RECOMMENDATIONS FOR RAG SYSTEM:")
-    print("=" * 80)
-    print("""
+    buf.write("\n" + HEADER + "\n")
+    buf.write("RECOMMENDATIONS FOR RAG SYSTEM:\n")
+    buf.write(HEADER + "\n")
+    buf.write("""
 For your RAG system, use the EMBEDDING models from the list above.
 Common embedding models:
   - models/embedding-001
@@ -111,8 +157,9 @@ For example:
         google_api_key=google_api_key
     )
 """)
-    
-    
+
+    sys.stdout.write(buf.getvalue())
+
 except Exception as e:
     print(f"❌ ERROR: {str(e)}")
     print("\nMake sure:")
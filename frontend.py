@@ -3,29 +3,17 @@ Frontend module for AI Chatbot
 Handles Streamlit UI and user interactions
 """
 
+import os
+
 import streamlit as st
 from typing import Tuple, Dict, Any
 
+from backend import AIBackend
+from utils import MessageFormatter
 
-class ChatbotUI:
-    """
-    Frontend class for managing the chatbot user interface
-    """
-    
-    @staticmethod
-    def configure_page() -> None:
-        """Configure Streamlit page settings"""
-        st.set_page_config(
-            page_title="AI Chatbot",
-            page_icon="🤖",
-            layout="wide",
-            initial_sidebar_state="expanded"
-        )
-    
-    @staticmethod
-    def apply_styles() -> None:
-        """Apply custom CSS styling to the application"""
-        st.markdown("""
+
+# Static CSS emitted on every Streamlit rerun - built once at import
+_STYLES = """
             <style>
                 /* Navigation bar styling */
                 header {
@@ -93,7 +81,33 @@ class ChatbotUI:
                     border: 1px solid #e0e0e0;
                 }
             </style>
-        """, unsafe_allow_html=True)
+        """
+
+
+
+# Per-message HTML templates, bound once at module scope
+_USER_MSG_TMPL = '<div class="chat-message user"><div class="message-content">{content}</div></div>'
+_ASSISTANT_MSG_TMPL = '<div class="chat-message assistant"><div class="message-content">{content}</div></div>'
+
+class ChatbotUI:
+    """
+    Frontend class for managing the chatbot user interface
+    """
+    
+    @staticmethod
+    def configure_page() -> None:
+        """Configure Streamlit page settings"""
+        st.set_page_config(
+            page_title="AI Chatbot",
+            page_icon="🤖",
+            layout="wide",
+            initial_sidebar_state="expanded"
+        )
+    
+    @staticmethod
+    def apply_styles() -> None:
+        """Apply custom CSS styling to the application"""
+        st.markdown(_STYLES, unsafe_allow_html=True)
     
     @staticmethod
     def render_sidebar() -> Tuple[str, str, float, int, bool]:
@@ -103,8 +117,6 @@ class ChatbotUI:
         Returns:
             Tuple containing (api_key, model_name, temperature, max_tokens, clear_clicked)
         """
-        import os
-        
         st.sidebar.title("⚙️ Settings")
         
         # Get API key from environment only (no user input field)
@@ -171,17 +183,19 @@ class ChatbotUI:
         Args:
             messages: List of message dictionaries with 'role' and 'content' keys
         """
-        for message in messages:
-            if message["role"] == "user":
-                st.markdown(
-                    f'<div class="chat-message user"><div class="message-content">{message["content"]}</div></div>',
-                    unsafe_allow_html=True
-                )
-            else:
-                st.markdown(
-                    f'<div class="chat-message assistant"><div class="message-content">{message["content"]}</div></div>',
-                    unsafe_allow_html=True
-                )
+        if not messages:
+            return
+
+        # Build the whole history as one HTML string and emit it with a
+        # single st.markdown call - one Streamlit component instead of N.
+        # Content is escaped since the markdown is rendered as raw HTML
+        html = "".join(
+            (_USER_MSG_TMPL if message["role"] == "user" else _ASSISTANT_MSG_TMPL).format(
+                content=MessageFormatter.escape_html(message["content"])
+            )
+            for message in messages
+        )
+        st.markdown(html, unsafe_allow_html=True)
     
     @staticmethod
     def render_input_area() -> Tuple[str, bool]:
@@ -256,7 +270,6 @@ class ChatbotUI:
             st.session_state.messages = []
         
         if "backend" not in st.session_state:
-            from backend import AIBackend
             st.session_state.backend = AIBackend()
     
     @staticmethod
@@ -7,6 +7,20 @@ import os
 from typing import Optional, Tuple
 import re
 
+# Google API keys are 'AIza' plus 35 URL-safe characters; one compiled
+# match replaces the strip/len heuristic and gives a real format check
+_GOOGLE_KEY_RE = re.compile(r'^AIza[0-9A-Za-z_-]{35}$')
+
+# Translation table built once at import for HTML escaping - a single
+# str.translate pass replaces five chained str.replace copies
+_HTML_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&#39;"
+})
+
 
 class EnvironmentManager:
     """Class for managing environment variables"""
@@ -64,10 +78,10 @@ class InputValidator:
         """
         if not api_key:
             return False, "API key is required"
-        
-        if len(api_key.strip()) < 10:
-            return False, "API key appears to be invalid (too short)"
-        
+
+        if _GOOGLE_KEY_RE.match(api_key) is None:
+            return False, "API key format is invalid (expected a Google API key starting with 'AIza')"
+
         return True, None
     
     @staticmethod
@@ -160,19 +174,7 @@ class MessageFormatter:
         Returns:
             Escaped text
         """
-        replacements = {
-            "&": "&amp;",
-            "<": "&lt;",
-            ">": "&gt;",
-            '"': "&quot;",
-            "'": "&#39;"
-        }
-        
-        result = text
-        for char, replacement in replacements.items():
-            result = result.replace(char, replacement)
-        
-        return result
+        return text.translate(_HTML_ESCAPE_TABLE)
 
 
 class SessionManager: